@@ -0,0 +1,46 @@
+"""On-disk caches that survive app restarts.
+
+Entries are content-addressed: embeddings are keyed by a SHA-1 of the
+encoded text and scraped article bodies by a SHA-1 of their URL, so the
+same text is never re-encoded and the same page is not re-scraped while
+its entry is fresh.
+
+``body_store`` is not a cache: it holds full article bodies keyed by
+Qdrant point ID, so the vector payload only has to carry a short summary.
+It therefore lives under ``DATA_DIR`` rather than ``CACHE_DIR``, which is
+safe to delete, and never evicts entries.
+"""
+
+import hashlib
+import os
+import diskcache
+
+# ─────────────────────────────────────────────
+# Configuration
+# ─────────────────────────────────────────────
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(PROJECT_ROOT, "AI_Chatbot", "data"))
+BODY_STORE_DIR = os.path.join(DATA_DIR, "article_bodies")
+ARTICLE_TTL = int(os.getenv("ARTICLE_CACHE_TTL", str(6 * 60 * 60)))
+
+# ─────────────────────────────────────────────
+# Initialize
+# ─────────────────────────────────────────────
+embedding_cache = diskcache.Cache(os.path.join(CACHE_DIR, "emb"))
+article_cache = diskcache.Cache(os.path.join(CACHE_DIR, "articles"))
+
+
+def open_body_store() -> diskcache.Cache:
+    """Open the article body store shared by the app and ``data_ingestion.py``."""
+    # diskcache defaults to a 1 GB limit with eviction; a body that is
+    # silently dropped can only come back through re-ingestion.
+    return diskcache.Cache(BODY_STORE_DIR, eviction_policy="none")
+
+
+body_store = open_body_store()
+
+
+def content_key(text: str) -> str:
+    """Return the cache key for a piece of content."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,169 @@
+"""Sentence embedding model shared by seeding and semantic search.
+
+Stored vectors and query vectors must come from the same model, so the
+model is loaded here once and imported by both the Qdrant client and the
+pipeline nodes. The vector size is read from the model rather than
+hard-coded, so swapping ``EMBED_MODEL`` resizes new collections to match.
+
+When ``EMBED_SERVER_URL`` points at an embedding server (Infinity,
+TextEmbed, or anything speaking the OpenAI ``/embeddings`` API), inference
+happens there instead and no model weights are loaded in this process.
+"""
+
+import os
+import httpx
+import numpy as np
+
+from AI_Chatbot.clients.cache_client import embedding_cache, content_key
+
+# ─────────────────────────────────────────────
+# Configuration
+# ─────────────────────────────────────────────
+EMBED_MODEL = os.getenv("EMBED_MODEL", "BAAI/bge-small-en-v1.5")
+# Minimum similarity for a stored document to count as relevant. Score
+# ranges differ per model: BGE compresses unrelated text into roughly
+# 0.5-0.7, so it needs a much higher cut-off than MPNet did.
+DEFAULT_SCORE_THRESHOLDS = {
+    "BAAI/bge-small-en-v1.5": 0.8,
+    "sentence-transformers/all-mpnet-base-v2": 0.5,
+}
+RAG_SCORE_THRESHOLD = float(
+    os.getenv("RAG_SCORE_THRESHOLD", DEFAULT_SCORE_THRESHOLDS.get(EMBED_MODEL, 0.5))
+)
+EMBED_SERVER_URL = os.getenv("EMBED_SERVER_URL")
+EMBED_SERVER_TIMEOUT = float(os.getenv("EMBED_SERVER_TIMEOUT", "30"))
+# "onnx" runs the CPU model through ONNX Runtime. EMBED_ONNX_DIR points at a
+# local export of EMBED_MODEL (which keeps naming the hub model, so score
+# thresholds and ingestion still resolve); EMBED_ONNX_FILE selects a
+# specific export inside it, e.g. an int8-quantized one.
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+EMBED_ONNX_DIR = os.getenv("EMBED_ONNX_DIR")
+EMBED_ONNX_FILE = os.getenv("EMBED_ONNX_FILE")
+# Opt-in: compile the PyTorch CPU model with torch.compile. The first
+# encodes get slower while kernels compile; later ones get faster.
+EMBED_COMPILE = os.getenv("EMBED_COMPILE", "0") == "1"
+# Optional cross-encoder used to rerank semantic search candidates,
+# e.g. "cross-encoder/ms-marco-MiniLM-L-6-v2". Unset disables reranking.
+RERANK_MODEL = os.getenv("RERANK_MODEL")
+
+
+class RemoteEmbedder:
+    """Minimal ``SentenceTransformer`` stand-in backed by an embedding server.
+
+    Only the parts of the API this project uses are provided: ``encode``
+    and ``get_sentence_embedding_dimension``. Each ``encode`` call is sent
+    as a single request; the server does its own batching.
+    """
+
+    def __init__(self, base_url: str, model_name: str, timeout: float = EMBED_SERVER_TIMEOUT):
+        self.model_name = model_name
+        self._client = httpx.Client(base_url=base_url.rstrip("/"), timeout=timeout)
+        self._dimension = None
+
+    def encode(self, sentences, normalize_embeddings: bool = False, **_ignored):
+        """Return embeddings as a float32 numpy array (1-D for a single string)."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        resp = self._client.post("/embeddings", json={"model": self.model_name, "input": texts})
+        resp.raise_for_status()
+        data = sorted(resp.json()["data"], key=lambda d: d["index"])
+        vectors = np.asarray([d["embedding"] for d in data], dtype=np.float32)
+        if normalize_embeddings:
+            vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Return the vector size, probing the server once on first use."""
+        if self._dimension is None:
+            self._dimension = self.encode(["dimension probe"]).shape[1]
+        return self._dimension
+
+
+def load_embedder(model_name: str = EMBED_MODEL):
+    """Return the embedding backend for ``model_name``.
+
+    Uses the embedding server when ``EMBED_SERVER_URL`` is set. Otherwise
+    loads the model in-process on CUDA in fp16 when available, or on all
+    CPU cores (through ONNX Runtime when ``EMBED_BACKEND=onnx``, or with
+    the transformer compiled when ``EMBED_COMPILE=1``).
+    """
+    if EMBED_SERVER_URL:
+        return RemoteEmbedder(EMBED_SERVER_URL, model_name)
+
+    # Imported lazily so server-backed deployments never load torch.
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if torch.cuda.is_available():
+        return SentenceTransformer(model_name, device="cuda").half()
+    torch.set_num_threads(os.cpu_count())
+    if EMBED_BACKEND == "onnx":
+        model_kwargs = {"file_name": EMBED_ONNX_FILE} if EMBED_ONNX_FILE else None
+        return SentenceTransformer(
+            EMBED_ONNX_DIR or model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs
+        )
+    model = SentenceTransformer(model_name, device="cpu")
+    if EMBED_COMPILE:
+        # Compile the inner Hugging Face module: encode() calls it directly,
+        # and batches vary in sequence length, hence dynamic shapes.
+        transformer = model[0]
+        transformer.auto_model = torch.compile(transformer.auto_model, dynamic=True)
+    return model
+
+
+def load_reranker(model_name: str = RERANK_MODEL):
+    """Return a ``CrossEncoder`` for ``model_name``, or None when unset.
+
+    The reranker always runs in-process, on CUDA when available.
+    """
+    if not model_name:
+        return None
+    import torch
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name, device="cuda" if torch.cuda.is_available() else "cpu")
+
+
+# ─────────────────────────────────────────────
+# Initialize
+# ─────────────────────────────────────────────
+embedder = load_embedder()
+VECTOR_SIZE = embedder.get_sentence_embedding_dimension()
+reranker = load_reranker()
+
+
+def encode_cached(texts: list, normalize_embeddings: bool = False, **encode_kwargs) -> np.ndarray:
+    """Encode ``texts``, running the model only on texts not seen before.
+
+    Vectors are cached as float16 to halve their on-disk size; the key
+    includes the model name and normalization so changing either never
+    returns a stale vector.
+    """
+    keys = [content_key(f"{EMBED_MODEL}|{normalize_embeddings}|{t}") for t in texts]
+    vectors = [None] * len(texts)
+    misses = []
+    for i, key in enumerate(keys):
+        raw = embedding_cache.get(key)
+        if raw is None:
+            misses.append(i)
+        else:
+            vectors[i] = np.frombuffer(raw, dtype=np.float16)
+
+    if misses:
+        fresh = embedder.encode(
+            [texts[i] for i in misses],
+            convert_to_numpy=True,
+            normalize_embeddings=normalize_embeddings,
+            **encode_kwargs,
+        )
+        for i, vector in zip(misses, fresh):
+            vector = vector.astype(np.float16)
+            embedding_cache.set(keys[i], vector.tobytes())
+            vectors[i] = vector
+
+    if not vectors:
+        return np.empty((0, VECTOR_SIZE), dtype=np.float32)
+    return np.vstack(vectors).astype(np.float32)
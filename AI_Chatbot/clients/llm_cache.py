@@ -0,0 +1,165 @@
+"""Two-tier cache for Gemini responses.
+
+The first tier is an in-process exact-match map keyed by a hash of the full
+prompt. The second is semantic: responses are stored in a small Qdrant
+collection next to the embedding of the user's question, and a later
+question whose embedding scores at least ``LLM_CACHE_THRESHOLD`` against a
+stored one reuses that response. Entries are tagged with the pipeline node
+that produced them so, for example, a ticker lookup never answers a
+summary request, and with the retrieved context (``scope``) they were
+grounded in, so a question about one company never reuses an answer built
+from another company's documents. Entries in both tiers expire after ``LLM_CACHE_TTL``
+seconds, and re-seeding or re-ingesting the corpus clears the semantic
+tier (see :func:`clear_llm_cache`), so answers never outlive their sources.
+
+Cache failures are logged and treated as misses; they never fail a node.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from cachetools import TTLCache
+from qdrant_client.http import models as rest
+
+from AI_Chatbot.clients.cache_client import content_key
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# Configuration
+# ─────────────────────────────────────────────
+LLM_CACHE_COLLECTION = os.getenv("LLM_CACHE_COLLECTION", "llm_cache")
+LLM_CACHE_THRESHOLD = float(os.getenv("LLM_CACHE_THRESHOLD", "0.92"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(24 * 60 * 60)))
+EXACT_CACHE_SIZE = 1024
+
+
+class LLMResponseCache:
+    """Exact + semantic response cache backed by ``qdrant``."""
+
+    def __init__(self, qdrant, vector_size: int, collection_name: str = LLM_CACHE_COLLECTION,
+                 threshold: float = LLM_CACHE_THRESHOLD):
+        self._qdrant = qdrant
+        self._collection = collection_name
+        self._threshold = threshold
+        self._exact = TTLCache(maxsize=EXACT_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+        # Lookups and stores arrive from worker threads of concurrent sessions.
+        self._exact_lock = threading.Lock()
+        self._ready = self._ensure_collection(vector_size)
+
+    def _ensure_collection(self, vector_size: int) -> bool:
+        try:
+            if self._qdrant.collection_exists(self._collection):
+                vectors = self._qdrant.get_collection(self._collection).config.params.vectors
+                size = getattr(vectors, "size", None)
+                if size is None or size == vector_size:
+                    return True
+                # Built for another embedding model: every query would fail.
+                logger.warning(
+                    "LLM cache: '%s' holds %d-dim vectors, expected %d; recreating it.",
+                    self._collection, size, vector_size,
+                )
+            self._qdrant.recreate_collection(
+                collection_name=self._collection,
+                vectors_config=rest.VectorParams(size=vector_size, distance=rest.Distance.DOT),
+            )
+            for field_name, field_schema in (
+                ("node", rest.PayloadSchemaType.KEYWORD),
+                ("scope", rest.PayloadSchemaType.KEYWORD),
+                ("created_at", rest.PayloadSchemaType.FLOAT),
+            ):
+                self._qdrant.create_payload_index(
+                    collection_name=self._collection,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+            logger.info("LLM cache: created collection '%s'.", self._collection)
+            return True
+        except Exception as e:
+            logger.warning("LLM cache: semantic tier disabled: %s", e)
+            return False
+
+    def lookup(self, node: str, prompt: str, vector=None, scope: str = ""):
+        """Return a cached response for ``prompt`` (or a similar question), or None.
+
+        ``vector`` is the unit-length embedding of the user's question; without
+        it only the exact tier is consulted. Semantic hits must also have been
+        stored under the same ``scope``.
+        """
+        with self._exact_lock:
+            hit = self._exact.get(content_key(f"{node}|{prompt}"))
+        if hit is not None or vector is None or not self._ready:
+            return hit
+        try:
+            points = self._qdrant.query_points(
+                collection_name=self._collection,
+                query=vector.tolist(),
+                query_filter=rest.Filter(
+                    must=[
+                        rest.FieldCondition(key="node", match=rest.MatchValue(value=node)),
+                        rest.FieldCondition(
+                            key="scope", match=rest.MatchValue(value=content_key(scope))
+                        ),
+                        rest.FieldCondition(
+                            key="created_at", range=rest.Range(gte=time.time() - LLM_CACHE_TTL)
+                        ),
+                    ]
+                ),
+                limit=1,
+                score_threshold=self._threshold,
+                with_payload=["response"],
+            ).points
+        except Exception as e:
+            logger.warning("LLM cache: lookup failed: %s", e)
+            return None
+        return points[0].payload["response"] if points else None
+
+    def store(self, node: str, prompt: str, response: str, vector=None, question: str = "",
+              scope: str = ""):
+        """Record ``response`` under ``prompt`` and, given ``vector``, under ``question``."""
+        with self._exact_lock:
+            self._exact[content_key(f"{node}|{prompt}")] = response
+        if vector is None or not self._ready:
+            return
+        try:
+            self._qdrant.upsert(
+                collection_name=self._collection,
+                points=[
+                    rest.PointStruct(
+                        # One entry per (node, scope, question); re-asking overwrites it.
+                        id=str(uuid.uuid5(
+                            uuid.NAMESPACE_URL, f"{node}|{content_key(scope)}|{question}"
+                        )),
+                        vector=vector.tolist(),
+                        payload={
+                            "node": node,
+                            "question": question,
+                            "scope": content_key(scope),
+                            "response": response,
+                            "created_at": time.time(),
+                        },
+                    )
+                ],
+                wait=False,
+            )
+        except Exception as e:
+            logger.warning("LLM cache: store failed: %s", e)
+
+
+def clear_llm_cache(qdrant, collection_name: str = LLM_CACHE_COLLECTION):
+    """Delete every semantic-tier entry, keeping the collection itself.
+
+    Called when the corpus is rebuilt: cached RAG answers were grounded in
+    the old documents.
+    """
+    try:
+        if qdrant.collection_exists(collection_name):
+            qdrant.delete(
+                collection_name=collection_name,
+                points_selector=rest.FilterSelector(filter=rest.Filter()),
+            )
+            logger.info("LLM cache: cleared '%s'.", collection_name)
+    except Exception as e:
+        logger.warning("LLM cache: failed to clear '%s': %s", collection_name, e)
@@ -4,86 +4,226 @@ Provides functions to initialize the Qdrant client, ensure the collection
 exists, and seed it from a JSON file if necessary.
 """
 
+import logging
 import os
-import json
+import collections
+import ijson
+from concurrent.futures import ThreadPoolExecutor
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as rest
-from sentence_transformers import SentenceTransformer
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from AI_Chatbot.clients.cache_client import body_store
+from AI_Chatbot.clients.llm_cache import clear_llm_cache
+from AI_Chatbot.clients.embedding_client import encode_cached, EMBED_MODEL, VECTOR_SIZE
+
+logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
 # Configuration
 # ─────────────────────────────────────────────
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 COLLECTION_NAME = os.getenv("QDRANT_COLLECTION", "news_embeddings")
-EMBED_MODEL = os.getenv("EMBED_MODEL", "sentence-transformers/all-mpnet-base-v2")
 SEED_FILE = os.getenv("QDRANT_SEED_FILE", "eb9f97b1-74a3-4299-ab60-293131883956.json")
+SEED_CHUNK_SIZE = int(os.getenv("QDRANT_SEED_CHUNK_SIZE", "512"))
+UPLOAD_PARALLEL = int(os.getenv("QDRANT_UPLOAD_PARALLEL", "8"))
+UPLOAD_BATCH_SIZE = int(os.getenv("QDRANT_UPLOAD_BATCH_SIZE", "256"))
+# Qdrant's default; restored once a bulk upload has finished.
+INDEXING_THRESHOLD = 20000
 
 # ─────────────────────────────────────────────
 # Initialize
 # ─────────────────────────────────────────────
-embedder = SentenceTransformer(EMBED_MODEL)
-VECTOR_SIZE = embedder.get_sentence_embedding_dimension()
 qdrant = QdrantClient(url=QDRANT_URL)
 
 
+def _create_collection():
+    """(Re)create the collection sized for the configured embedding model."""
+    logger.info(
+        "Qdrant: creating collection '%s' (%d-dim, dot metric, int8 quantized)",
+        COLLECTION_NAME, VECTOR_SIZE,
+    )
+    qdrant.recreate_collection(
+        collection_name=COLLECTION_NAME,
+        # Search runs on int8 copies held in RAM; the original fp32
+        # vectors stay on disk for rescoring.
+        vectors_config=rest.VectorParams(
+            size=VECTOR_SIZE, distance=rest.Distance.DOT, on_disk=True
+        ),
+        quantization_config=rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        ),
+    )
+    logger.info("Qdrant: created collection '%s'.", COLLECTION_NAME)
+
+
 def ensure_collection_exists():
-    """Check and create collection if missing."""
+    """Check and create collection if missing.
+
+    Returns the collection's point count (0 for a freshly created one), or
+    None when the collection could not be verified. A single
+    ``get_collection`` call answers "does it exist", "is it seeded" and
+    "does it match the embedding model". A collection built for a
+    different vector size is recreated (and so re-seeded), since every
+    query against it would fail.
+    """
     try:
-        collections = qdrant.get_collections().collections
-        existing = [c.name for c in collections]
-        if COLLECTION_NAME not in existing:
-            print(f"Qdrant: creating collection '{COLLECTION_NAME}' ({VECTOR_SIZE}-dim, cosine metric)")
-            qdrant.recreate_collection(
-                collection_name=COLLECTION_NAME,
-                vectors_config=rest.VectorParams(size=VECTOR_SIZE, distance=rest.Distance.COSINE),
+        try:
+            info = qdrant.get_collection(COLLECTION_NAME)
+        except UnexpectedResponse as e:
+            if e.status_code != 404:
+                raise
+            _create_collection()
+            return 0
+        vectors = info.config.params.vectors
+        size = getattr(vectors, "size", None)
+        if size is not None and size != VECTOR_SIZE:
+            logger.warning(
+                "Qdrant: collection '%s' holds %d-dim vectors but %s produces %d-dim; recreating it.",
+                COLLECTION_NAME, size, EMBED_MODEL, VECTOR_SIZE,
             )
-            print(f"Qdrant: created collection '{COLLECTION_NAME}'.")
-        else:
-            print(f"Qdrant: collection '{COLLECTION_NAME}' already exists.")
+            _create_collection()
+            return 0
+        logger.info("Qdrant: collection '%s' already exists.", COLLECTION_NAME)
+        return info.points_count or 0
     except Exception as e:
-        print(f"Qdrant: failed to verify collection: {e}")
+        logger.warning("Qdrant: failed to verify collection: %s", e)
+        return None
+
+
+def _iter_seed_chunks(f):
+    """Yield lists of up to SEED_CHUNK_SIZE documents streamed from ``f``."""
+    chunk = []
+    for doc in ijson.items(f, "item"):
+        chunk.append(doc)
+        if len(chunk) == SEED_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_seed_columns(f):
+    """Yield ``(ids, vectors, payloads)`` column lists, one per encoded chunk."""
+    next_id = 0
+    for docs in _iter_seed_chunks(f):
+        texts = [f"{doc.get('title', '')} {doc.get('full_text', '')}" for doc in docs]
+        # Unit-length vectors make dot product equal to cosine similarity.
+        vectors = encode_cached(
+            texts,
+            normalize_embeddings=True,
+            batch_size=64,
+            show_progress_bar=False,
+        )
+        ids = list(range(next_id, next_id + len(docs)))
+        # Full bodies go to the local body store; the payload only keeps a
+        # summary, which is all Qdrant needs to hold in memory.
+        payloads = []
+        for point_id, doc in zip(ids, docs):
+            full_text = doc.get("full_text", "")
+            body_store.set(str(point_id), full_text)
+            payloads.append(
+                {
+                    "title": doc.get("title", ""),
+                    "ticker": doc.get("ticker", ""),
+                    "link": doc.get("link", ""),
+                    "summary": full_text[:500],
+                }
+            )
+        yield ids, vectors.tolist(), payloads
+        next_id += len(docs)
+
+
+def _upsert_columns(columns):
+    """Upsert ``(ids, vectors, payloads)`` chunks as column-oriented batches.
+
+    Each chunk is cut into ``UPLOAD_BATCH_SIZE`` slices, each sent as one
+    ``rest.Batch`` of parallel arrays (validated once per batch, not once
+    per point) from ``UPLOAD_PARALLEL`` threads. At most twice that many
+    requests are in flight, so encoding never runs far ahead of the upload.
+    """
+    in_flight = collections.deque()
+    with ThreadPoolExecutor(UPLOAD_PARALLEL) as pool:
+        for ids, vectors, payloads in columns:
+            for start in range(0, len(ids), UPLOAD_BATCH_SIZE):
+                end = start + UPLOAD_BATCH_SIZE
+                batch = rest.Batch(
+                    ids=ids[start:end], vectors=vectors[start:end], payloads=payloads[start:end]
+                )
+                in_flight.append(
+                    pool.submit(qdrant.upsert, collection_name=COLLECTION_NAME, points=batch, wait=True)
+                )
+                while len(in_flight) > 2 * UPLOAD_PARALLEL:
+                    in_flight.popleft().result()
+        for future in in_flight:
+            future.result()
 
 
-def seed_from_json():
-    """Seed the collection with JSON data if it's empty."""
+def seed_from_json(count=None):
+    """Seed the collection with JSON data if it's empty.
+
+    ``count`` is the known point count from :func:`ensure_collection_exists`;
+    it is only fetched from Qdrant when not supplied. The seed file is
+    streamed so only one chunk of documents (and its vectors) is held in
+    memory at a time, whatever the corpus size.
+
+    Points without their bodies in ``body_store`` are useless for answers,
+    so a populated collection is re-seeded when the store is empty (e.g.
+    it was deleted or ``DATA_DIR`` changed).
+    """
     try:
-        count = qdrant.count(COLLECTION_NAME).count
-        if count > 0:
-            print(f"Qdrant: '{COLLECTION_NAME}' already has {count} points.")
+        if count is None:
+            count = qdrant.count(COLLECTION_NAME).count
+        if count > 0 and len(body_store) > 0:
+            logger.info("Qdrant: '%s' already has %d points.", COLLECTION_NAME, count)
             return
 
         if not os.path.exists(SEED_FILE):
-            print(f"Qdrant: no seed file found at {SEED_FILE}; skipping seeding")
-            return
-
-        with open(SEED_FILE, "r") as f:
-            data = json.load(f)
-
-        if not isinstance(data, list):
-            print("Qdrant: invalid JSON format (expected list of documents)")
+            if count > 0:
+                logger.warning(
+                    "Qdrant: '%s' has %d points but the article body store is empty and no "
+                    "seed file was found at %s; re-run data_ingestion.py to restore it.",
+                    COLLECTION_NAME, count, SEED_FILE,
+                )
+            else:
+                logger.info("Qdrant: no seed file found at %s; skipping seeding", SEED_FILE)
             return
 
-        print(f"Qdrant: seeding {len(data)} documents into '{COLLECTION_NAME}'")
-        points = []
-        for i, doc in enumerate(data):
-            text = f"{doc.get('title', '')} {doc.get('full_text', '')}"
-            vector = embedder.encode(text).tolist()
-            points.append(
-                rest.PointStruct(
-                    id=i,
-                    vector=vector,
-                    payload={
-                        "title": doc.get("title", ""),
-                        "ticker": doc.get("ticker", ""),
-                        "full_text": doc.get("full_text", ""),
-                    },
+        with open(SEED_FILE, "rb") as f:
+            _, event, _ = next(ijson.parse(f))
+            if event != "start_array":
+                logger.warning("Qdrant: invalid JSON format (expected list of documents)")
+                return
+            f.seek(0)
+
+            if count > 0:
+                logger.warning(
+                    "Qdrant: '%s' has %d points but the article body store is empty; re-seeding.",
+                    COLLECTION_NAME, count,
                 )
+                _create_collection()
+            logger.info("Qdrant: seeding '%s' from %s", COLLECTION_NAME, SEED_FILE)
+            # Cached answers were grounded in whatever corpus came before.
+            clear_llm_cache(qdrant)
+            # Defer HNSW indexing until every batch has landed.
+            qdrant.update_collection(
+                collection_name=COLLECTION_NAME,
+                optimizers_config=rest.OptimizersConfigDiff(indexing_threshold=0),
             )
+            try:
+                _upsert_columns(_iter_seed_columns(f))
+            finally:
+                qdrant.update_collection(
+                    collection_name=COLLECTION_NAME,
+                    optimizers_config=rest.OptimizersConfigDiff(indexing_threshold=INDEXING_THRESHOLD),
+                )
 
-        qdrant.upsert(collection_name=COLLECTION_NAME, points=points)
-        print(f"Qdrant: inserted {len(points)} documents")
+        inserted = qdrant.count(COLLECTION_NAME).count
+        logger.info("Qdrant: inserted %d documents", inserted)
     except Exception as e:
-        print(f"Qdrant: seeding failed: {e}")
+        logger.error("Qdrant: seeding failed: %s", e)
 
 
 # ─────────────────────────────────────────────
@@ -91,8 +231,8 @@ def seed_from_json():
 # ─────────────────────────────────────────────
 def initialize_qdrant():
     """Run Qdrant initialization steps and return the client."""
-    ensure_collection_exists()
-    seed_from_json()
+    count = ensure_collection_exists()
+    seed_from_json(count)
     return qdrant
 
 
@@ -0,0 +1,91 @@
+"""Micro-batching for concurrent Qdrant searches.
+
+Each Streamlit session runs its pipeline on its own event loop, so the
+batcher is thread-based: callers from any thread or loop submit a request
+and get back a ``concurrent.futures.Future``. A single worker thread waits
+a short window after the first request, then sends everything collected so
+far as one batched call.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collect requests for ``window`` seconds and flush them together.
+
+    ``flush`` receives a list of requests and must return one result per
+    request, in order. If it raises, every future in the batch gets the
+    exception.
+    """
+
+    def __init__(self, flush, window: float = 0.02, max_batch: int = 64):
+        self._flush = flush
+        self._window = window
+        self._max_batch = max_batch
+        self._pending = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="qdrant-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, request) -> Future:
+        """Queue ``request`` for the next flush and return its future."""
+        future = Future()
+        self._pending.put((request, future))
+        return future
+
+    def _run(self):
+        # The worker is the only thread that resolves futures; it must never
+        # exit, or every later submit() would wait forever.
+        while True:
+            try:
+                self._flush_next_batch()
+            except Exception:
+                logger.exception("Search batcher failed to process a batch")
+
+    def _flush_next_batch(self):
+        batch = [self._pending.get()]
+        # The window starts when the first request of a batch arrives.
+        deadline = time.monotonic() + self._window
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Callers whose awaiting task was cancelled have cancelled their
+        # future; skip them. The rest can no longer be cancelled.
+        batch = [
+            (request, future) for request, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        requests, futures = zip(*batch)
+        try:
+            results = list(self._flush(list(requests)))
+            if len(results) != len(futures):
+                raise ValueError(f"flush returned {len(results)} results for {len(futures)} requests")
+        except Exception as e:
+            logger.warning("Batched search of %d requests failed: %s", len(batch), e)
+            for future in futures:
+                _deliver(future.set_exception, e)
+            return
+        for future, result in zip(futures, results):
+            _deliver(future.set_result, result)
+
+
+def _deliver(setter, value):
+    """Resolve a future, ignoring one that was already resolved."""
+    try:
+        setter(value)
+    except InvalidStateError:
+        pass
@@ -5,64 +5,143 @@ given ticker or comma-separated tickers. The function normalizes the
 tool output and attempts to scrape article bodies when a link is available.
 """
 
-from bs4 import BeautifulSoup
-import requests
+import asyncio
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+from selectolax.parser import HTMLParser
 from langchain_community.tools.yahoo_finance_news import YahooFinanceNewsTool
 
+from AI_Chatbot.clients.cache_client import article_cache, content_key, ARTICLE_TTL
+
+
+logger = logging.getLogger(__name__)
 
 # Initialize the Yahoo news tool once.
 yahoo_news_tool = YahooFinanceNewsTool()
 
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; StockBot/1.0)"}
+# Splits "aapl, tsla ,msft" on commas, swallowing the surrounding whitespace.
+TICKER_SEPARATOR = re.compile(r"\s*,\s*")
 
-def get_yahoo_news(ticker: str, num_articles: int = 5):
-    """Return a list of normalized article dictionaries for the ticker.
+# Article pages are fetched concurrently; cap in-flight requests so a large
+# ticker list does not open an unbounded number of sockets.
+FETCH_CONCURRENCY = 16
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Connection-level failures are retried with exponential backoff.
+FETCH_RETRIES = 2
+FETCH_BACKOFF = 0.3
 
-    Each dict contains: ticker, title, link, summary (snippet), and
-    full_text (when scraping succeeds).
+# The news tool is blocking, so per-ticker lookups run on a shared pool.
+tool_executor = ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY)
+
+
+def _run_news_tool(t: str, num_articles: int):
+    """Return the tool's raw result for one ticker, or None on failure."""
+    try:
+        return yahoo_news_tool.run({"query": t, "num_articles": num_articles})
+    except Exception as e:
+        logger.warning("Yahoo: tool failed for %s: %s", t, e)
+        return None
+
+
+async def _fetch_page(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str):
+    """Return the page HTML, or None when the server does not answer 200."""
+    async with semaphore:
+        for attempt in range(FETCH_RETRIES + 1):
+            try:
+                async with session.get(url, timeout=FETCH_TIMEOUT) as resp:
+                    if resp.status != 200:
+                        return None
+                    return await resp.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == FETCH_RETRIES:
+                    raise
+                await asyncio.sleep(FETCH_BACKOFF * 2 ** attempt)
+
+
+async def aget_yahoo_news(ticker: str, num_articles: int = 5):
+    """Async variant of :func:`get_yahoo_news`.
+
+    Ticker lookups and article scrapes for every ticker run concurrently
+    rather than one request at a time.
     """
-    parsed_articles = []
-    tickers = [t.strip().upper() for t in ticker.split(",") if t.strip()]
+    tickers = [t for t in TICKER_SEPARATOR.split(ticker.strip().upper()) if t]
 
-    for t in tickers:
-        try:
-            raw_articles = yahoo_news_tool.run({"query": t, "num_articles": num_articles})
-        except Exception as e:
-            print(f"Yahoo: tool failed for {t}: {e}")
-            continue
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(tool_executor, _run_news_tool, t, num_articles) for t in tickers)
+    )
 
+    pending = []
+    for t, raw_articles in zip(tickers, results):
         if isinstance(raw_articles, str) or not raw_articles:
             # Tool may return a string message or an empty result.
             continue
 
         for item in raw_articles:
-            if not isinstance(item, dict):
+            if not isinstance(item, dict) or not item.get("link"):
                 continue
+            pending.append((t, item))
 
-            title = item.get("title", "Untitled")
-            link = item.get("link", "")
-            if not link:
-                continue
+    # Reuse bodies scraped within ARTICLE_TTL; only fetch the rest.
+    cached = [article_cache.get(content_key(item["link"])) for _, item in pending]
+    to_fetch = [item["link"] for (_, item), body in zip(pending, cached) if body is None]
+
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+    # One pooled keep-alive connector for the whole batch: articles on the
+    # same Yahoo host reuse sockets instead of paying a TCP+TLS handshake
+    # each, and DNS lookups are cached.
+    connector = aiohttp.TCPConnector(
+        limit=2 * FETCH_CONCURRENCY,
+        limit_per_host=FETCH_CONCURRENCY,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+        fetched = await asyncio.gather(
+            *(_fetch_page(session, semaphore, link) for link in to_fetch),
+            return_exceptions=True,
+        )
+    pages = iter(fetched)
 
+    parsed_articles = []
+    for (t, item), body in zip(pending, cached):
+        if body is not None:
+            full_text = body
+        else:
+            page = next(pages)
             full_text = ""
             try:
-                headers = {"User-Agent": "Mozilla/5.0 (compatible; StockBot/1.0)"}
-                resp = requests.get(link, headers=headers, timeout=10)
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    paragraphs = soup.select("article p") or soup.select("p")
-                    full_text = " ".join(p.get_text(strip=True) for p in paragraphs[:15])
+                if isinstance(page, Exception):
+                    raise page
+                if page:
+                    tree = HTMLParser(page)
+                    paragraphs = tree.css("article p") or tree.css("p")
+                    full_text = " ".join(p.text(strip=True) for p in paragraphs[:15])
+                    article_cache.set(content_key(item["link"]), full_text, expire=ARTICLE_TTL)
             except Exception:
                 # Scraping failures are non-fatal; proceed with what we have.
                 full_text = item.get("summary", "") or ""
 
-            parsed_articles.append(
-                {
-                    "ticker": t,
-                    "title": title,
-                    "link": link,
-                    "summary": full_text[:500] if full_text else "",
-                    "full_text": full_text or "",
-                }
-            )
+        parsed_articles.append(
+            {
+                "ticker": t,
+                "title": item.get("title", "Untitled"),
+                "link": item["link"],
+                "summary": full_text[:500] if full_text else "",
+                "full_text": full_text or "",
+            }
+        )
 
     return parsed_articles
+
+
+def get_yahoo_news(ticker: str, num_articles: int = 5):
+    """Return a list of normalized article dictionaries for the ticker.
+
+    Each dict contains: ticker, title, link, summary (snippet), and
+    full_text (when scraping succeeds).
+    """
+    return asyncio.run(aget_yahoo_news(ticker, num_articles))
@@ -1,73 +1,177 @@
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-import json
+import ijson
+import collections
+import itertools
+import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-# ─────────────────────────────────────────────
-# 1️⃣ Load your dataset (JSON file)
-# ─────────────────────────────────────────────
-with open("stock_news.json", "r") as f:
-    data = json.load(f)
-
-# Flatten structure → list of documents
-documents = []
-for ticker, articles in data.items():
-    for article in articles:
-        full_text = article.get("full_text", "").strip()
-        if not full_text:
-            continue
-        documents.append({
-            "ticker": ticker,
-            "title": article.get("title", ""),
-            "link": article.get("link", ""),
-            "full_text": full_text
-        })
-
-print(f"Loaded {len(documents)} documents for embedding.")
-
-# ─────────────────────────────────────────────
-# 2️⃣ Initialize embedding model and Qdrant client
-# ─────────────────────────────────────────────
-model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
-
-qdrant = QdrantClient(url="http://localhost:6333")
-collection_name = "news_embeddings"
-
-# ─────────────────────────────────────────────
-# 3️⃣ Create / reset collection
-# ─────────────────────────────────────────────
-qdrant.recreate_collection(
-    collection_name=collection_name,
-    vectors_config=models.VectorParams(size=768, distance=models.Distance.COSINE)
-)
-print(f"✅ Collection '{collection_name}' created/reset.")
-
-# ─────────────────────────────────────────────
-# 4️⃣ Generate embeddings from full_text
-# ─────────────────────────────────────────────
-texts = [doc["full_text"] for doc in documents]
-print("Creating embeddings... this may take a moment.")
-embeddings = model.encode(texts, show_progress_bar=True)
-
-# ─────────────────────────────────────────────
-# 5️⃣ Prepare and insert into Qdrant
-# ─────────────────────────────────────────────
-points = []
-for i, doc in enumerate(documents):
-    points.append(
-        models.PointStruct(
-            id=str(uuid.uuid4()),
-            vector=embeddings[i].tolist(),   # vector = embedding of full_text
-            payload={                       # metadata payload
+# Run from the project root as ``python -m AI_Chatbot.data.data_ingestion``.
+# Full article bodies are kept out of Qdrant, keyed by point ID, in the
+# store the app reads them from.
+from AI_Chatbot.clients.cache_client import open_body_store
+
+# Must match the model used at query time (AI_Chatbot/clients/embedding_client.py).
+EMBED_MODEL = os.getenv("EMBED_MODEL", "BAAI/bge-small-en-v1.5")
+
+# Encoding fans out to worker processes, so the script body must only run
+# when executed directly (workers re-import this module on spawn). Uploads
+# fan out to threads.
+# EMBED_DEVICES picks the encode workers, e.g. "cuda:0,cuda:1" or "cpu,cpu,cpu,cpu";
+# unset, every visible GPU is used (or 4 CPU workers without CUDA).
+EMBED_DEVICES = os.getenv("EMBED_DEVICES")
+# Cached Gemini answers are grounded in the old corpus and are cleared on
+# re-ingest; must match LLM_CACHE_COLLECTION in AI_Chatbot/clients/llm_cache.py.
+LLM_CACHE_COLLECTION = os.getenv("LLM_CACHE_COLLECTION", "llm_cache")
+UPLOAD_PARALLEL = 8
+UPLOAD_BATCH_SIZE = 256
+INDEXING_THRESHOLD = 20000
+ENCODE_CHUNK_SIZE = 512
+
+
+def iter_documents(f):
+    """Stream the ticker → articles mapping as flat documents."""
+    for ticker, articles in ijson.kvitems(f, ""):
+        for article in articles:
+            full_text = article.get("full_text", "").strip()
+            if not full_text:
+                continue
+            yield {
+                "ticker": ticker,
+                "title": article.get("title", ""),
+                "link": article.get("link", ""),
+                "full_text": full_text
+            }
+
+
+def point_id(doc):
+    """Derive a stable point ID from the ticker and article link (or its text).
+
+    Re-ingesting the same article overwrites its point instead of adding a
+    duplicate under a fresh random ID. The ticker is part of the key because
+    one article can be listed under several tickers, and each listing is its
+    own record.
+    """
+    source = doc["link"] or doc["full_text"][:256]
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{doc['ticker']}|{source}"))
+
+
+def iter_columns(model, pool, bodies, documents):
+    """Yield ``(ids, vectors, payloads)`` column lists, one per encoded chunk.
+
+    Each document's full_text is written to ``bodies`` under its point ID;
+    the payload keeps only a 500-character summary.
+    """
+    while True:
+        chunk = list(itertools.islice(documents, ENCODE_CHUNK_SIZE))
+        if not chunk:
+            return
+        # Each worker's encode() length-sorts its share so mini-batches pad to
+        # a near-uniform length; results come back in the original order.
+        embeddings = model.encode_multi_process(
+            [doc["full_text"] for doc in chunk], pool, batch_size=64, normalize_embeddings=True
+        )
+        ids = [point_id(doc) for doc in chunk]
+        payloads = []
+        for pid, doc in zip(ids, chunk):
+            bodies.set(pid, doc["full_text"])
+            payloads.append({
                 "ticker": doc["ticker"],
                 "title": doc["title"],
                 "link": doc["link"],
-                "full_text": doc["full_text"]
-            }
+                "summary": doc["full_text"][:500]
+            })
+        yield ids, embeddings.tolist(), payloads
+
+
+def upsert_columns(qdrant, collection_name, columns):
+    """Upsert ``(ids, vectors, payloads)`` chunks as column-oriented batches.
+
+    Each UPLOAD_BATCH_SIZE slice goes out as one ``models.Batch`` of parallel
+    arrays (no per-point PointStruct) from UPLOAD_PARALLEL threads, with at
+    most twice that many requests in flight.
+    """
+    in_flight = collections.deque()
+    with ThreadPoolExecutor(UPLOAD_PARALLEL) as uploader:
+        for ids, vectors, payloads in columns:
+            for start in range(0, len(ids), UPLOAD_BATCH_SIZE):
+                end = start + UPLOAD_BATCH_SIZE
+                batch = models.Batch(
+                    ids=ids[start:end], vectors=vectors[start:end], payloads=payloads[start:end]
+                )
+                in_flight.append(uploader.submit(
+                    qdrant.upsert, collection_name=collection_name, points=batch, wait=True
+                ))
+                while len(in_flight) > 2 * UPLOAD_PARALLEL:
+                    in_flight.popleft().result()
+        for future in in_flight:
+            future.result()
+
+
+def main():
+    # ─────────────────────────────────────────────
+    # 1️⃣ Initialize embedding model and Qdrant client
+    # ─────────────────────────────────────────────
+    model = SentenceTransformer(EMBED_MODEL)
+
+    qdrant = QdrantClient(url="http://localhost:6333")
+    collection_name = "news_embeddings"
+
+    # ─────────────────────────────────────────────
+    # 2️⃣ Create / reset collection
+    # ─────────────────────────────────────────────
+    qdrant.recreate_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(
+            size=model.get_sentence_embedding_dimension(),
+            distance=models.Distance.DOT,   # vectors are L2-normalized at encode time
+            on_disk=True,                   # fp32 originals kept for rescoring
+        ),
+        quantization_config=models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        ),
+    )
+    print(f"✅ Collection '{collection_name}' created/reset.")
+    bodies = open_body_store()
+    bodies.clear()
+    if qdrant.collection_exists(LLM_CACHE_COLLECTION):
+        qdrant.delete(
+            collection_name=LLM_CACHE_COLLECTION,
+            points_selector=models.FilterSelector(filter=models.Filter()),
         )
+
+    # ─────────────────────────────────────────────
+    # 3️⃣ Stream the dataset (JSON file), embed full_text chunk by chunk
+    #    and bulk upload into Qdrant (indexing deferred until done)
+    # ─────────────────────────────────────────────
+    print("Creating embeddings... this may take a moment.")
+    qdrant.update_collection(
+        collection_name=collection_name,
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+    )
+    pool = model.start_multi_process_pool(
+        target_devices=EMBED_DEVICES.split(",") if EMBED_DEVICES else None
     )
+    try:
+        with open("stock_news.json", "rb") as f:
+            # vector = embedding of full_text, payload = metadata
+            upsert_columns(
+                qdrant, collection_name, iter_columns(model, pool, bodies, iter_documents(f))
+            )
+    finally:
+        model.stop_multi_process_pool(pool)
+        bodies.close()
+        qdrant.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=INDEXING_THRESHOLD),
+        )
+    inserted = qdrant.count(collection_name).count
+    print(f"✅ Inserted {inserted} embedded documents into Qdrant.")
 
-qdrant.upsert(collection_name=collection_name, points=points)
-print(f"✅ Inserted {len(points)} embedded documents into Qdrant.")
 
+if __name__ == "__main__":
+    main()
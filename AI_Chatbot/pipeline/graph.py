@@ -1,9 +1,11 @@
 """Graph builder for the RAG workflow.
 
-Provides routing and node wrapper functions and a `build_graph` helper that
-returns a compiled StateGraph ready for invocation.
+Provides routing functions, the RSS fallback node and a `build_graph`
+helper that returns a compiled StateGraph ready for invocation. Pipeline
+nodes are registered directly rather than through pass-through wrappers.
 """
 
+import functools
 import os
 from langgraph.graph import StateGraph, START, END
 from AI_Chatbot.pipeline.nodes import (
@@ -27,54 +29,40 @@ def route_after_semantic(state: PipelineState) -> str:
 
 def route_after_yahoo(state: PipelineState) -> str:
     """Return next node name after yahoo_fetch based on results."""
-    fetched = state.get("fetched_articles", [])
-    src = state.get("source", "none")
-    if fetched and len(fetched) > 0 and src == "yahoo_api":
+    # The fetch races Yahoo against RSS and dedupes the winner's articles,
+    # so any result is summarized as-is; rss_fallback only retries when
+    # both sources came back empty.
+    if state.get("fetched_articles"):
         return "summarize_yahoo"
     return "rss_fallback"
 
 
-def semantic_search_node(state):
-    return semantic_search(state)
-
-
-def summarize_rag_node(state):
-    return summarize(state)
-
-
-def extract_ticker_node(state):
-    return extract_ticker(state)
-
-
-def yahoo_fetch_node(state):
-    return yahoo_fetch_with_fallback(state)
-
-
-def summarize_yahoo_node(state):
-    return summarize_articles(state)
-
-
-def rss_fallback_node(state):
+async def rss_fallback_node(state):
     ticker = state.get("ticker", "Unknown")
-    rss_articles = get_yahoo_rss_news(ticker)
+    rss_articles = await get_yahoo_rss_news(ticker)
     if not rss_articles:
         return {"answer": f"No RSS news found for {ticker}.", "source": "rss_feed"}
-    return summarize_articles({
+    return await summarize_articles({
         "ticker": ticker,
         "fetched_articles": rss_articles,
         "source": "rss_feed",
     })
 
 
+@functools.lru_cache(maxsize=1)
 def build_graph():
-    """Construct and compile the workflow StateGraph."""
+    """Construct and compile the workflow StateGraph.
+
+    The compiled graph is cached, so repeated calls return the same
+    instance instead of re-validating and recompiling the workflow.
+    """
     workflow = StateGraph(PipelineState)
 
-    workflow.add_node("semantic_search", semantic_search_node)
-    workflow.add_node("summarize_rag", summarize_rag_node)
-    workflow.add_node("extract_ticker", extract_ticker_node)
-    workflow.add_node("yahoo_fetch", yahoo_fetch_node)
-    workflow.add_node("summarize_yahoo", summarize_yahoo_node)
+    workflow.add_node("semantic_search", semantic_search)
+    workflow.add_node("summarize_rag", summarize)
+    workflow.add_node("extract_ticker", extract_ticker)
+    workflow.add_node("yahoo_fetch", yahoo_fetch_with_fallback)
+    workflow.add_node("summarize_yahoo", summarize_articles)
     workflow.add_node("rss_fallback", rss_fallback_node)
 
     workflow.add_edge(START, "semantic_search")
@@ -6,6 +6,8 @@
 #   summarize_yahoo / rss_fallback / summarize_rag → END
 # ─────────────────────────────────────────────
 
+import functools
+import logging
 from langgraph.graph import StateGraph, START, END
 from AI_Chatbot.pipeline.nodes import (
     semantic_search,
@@ -18,6 +20,7 @@ from AI_Chatbot.pipeline.nodes import (
 )
 import sys
 
+logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
 # Routing functions
@@ -27,37 +30,30 @@ def route_after_semantic(state: PipelineState) -> str:
     docs = state.get("retrieved_docs")
     if docs and len(docs) > 0:
         return "summarize_rag"
-    print("[ROUTE] ❌ No RAG docs found → extracting ticker.")
     return "extract_ticker"
 
 
 def route_after_yahoo(state: PipelineState) -> str:
     """Route after yahoo_fetch → summarize_yahoo or rss_fallback."""
-    fetched = state.get("fetched_articles", [])
-    src = state.get("source", "none")
-    if fetched and len(fetched) > 0 and src == "yahoo_api":
-        print("[ROUTE] ✅ Yahoo API success → summarize_yahoo.")
+    # The fetch races Yahoo against RSS and dedupes the winner's articles,
+    # so any result is summarized as-is; rss_fallback only retries when
+    # both sources came back empty.
+    if state.get("fetched_articles"):
         return "summarize_yahoo"
-    print("[ROUTE] ⤵️ Yahoo failed/empty → fallback to RSS.")
     return "rss_fallback"
 
 
 # ─────────────────────────────────────────────
-# Node wrapper aliases for clarity
+# RSS fallback node (other nodes are registered directly)
 # ─────────────────────────────────────────────
-def semantic_search_node(state): return semantic_search(state)
-def summarize_rag_node(state): return summarize(state)
-def extract_ticker_node(state): return extract_ticker(state)
-def yahoo_fetch_node(state): return yahoo_fetch_with_fallback(state)
-def summarize_yahoo_node(state): return summarize_articles(state)
-def rss_fallback_node(state):
+async def rss_fallback_node(state):
     """RSS-only fallback summarization if Yahoo fetch fails."""
     ticker = state.get("ticker", "Unknown")
-    rss_articles = get_yahoo_rss_news(ticker)
+    rss_articles = await get_yahoo_rss_news(ticker)
     if not rss_articles:
-        print(f"[WARN] RSS returned empty for {ticker}.")
+        logger.warning("RSS returned empty for %s.", ticker)
         return {"answer": f"No RSS news found for {ticker}.", "source": "rss_feed"}
-    return summarize_articles({
+    return await summarize_articles({
         "ticker": ticker,
         "fetched_articles": rss_articles,
         "source": "rss_feed"
@@ -67,16 +63,17 @@ def rss_fallback_node(state):
 # ─────────────────────────────────────────────
 # Graph builder
 # ─────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
 def build_graph():
-    """Constructs the entire workflow graph."""
+    """Constructs the entire workflow graph (compiled once, then cached)."""
     workflow = StateGraph(PipelineState)
 
     # Add nodes
-    workflow.add_node("semantic_search", semantic_search_node)
-    workflow.add_node("summarize_rag", summarize_rag_node)
-    workflow.add_node("extract_ticker", extract_ticker_node)
-    workflow.add_node("yahoo_fetch", yahoo_fetch_node)
-    workflow.add_node("summarize_yahoo", summarize_yahoo_node)
+    workflow.add_node("semantic_search", semantic_search)
+    workflow.add_node("summarize_rag", summarize)
+    workflow.add_node("extract_ticker", extract_ticker)
+    workflow.add_node("yahoo_fetch", yahoo_fetch_with_fallback)
+    workflow.add_node("summarize_yahoo", summarize_articles)
     workflow.add_node("rss_fallback", rss_fallback_node)
 
     # Start → semantic_search
@@ -104,7 +101,7 @@ def build_graph():
     workflow.add_edge("summarize_yahoo", END)
     workflow.add_edge("rss_fallback", END)
 
-    print("[INFO] ✅ Workflow graph successfully built.")
+    logger.info("Workflow graph successfully built.")
     return workflow.compile()
 
 
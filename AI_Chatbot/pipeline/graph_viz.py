@@ -5,6 +5,7 @@ Standalone script to generate and export
 your LangGraph RAG workflow visualization.
 """
 
+import logging
 import os
 from langgraph.graph import StateGraph, START, END
 from AI_Chatbot.pipeline.nodes import (
@@ -17,6 +18,8 @@ from AI_Chatbot.pipeline.nodes import (
     get_yahoo_rss_news,
 )
 
+logger = logging.getLogger(__name__)
+
 # ─────────────────────────────────────────────
 # Routing functions
 # ─────────────────────────────────────────────
@@ -24,38 +27,39 @@ def route_after_semantic(state: PipelineState) -> str:
     """Route after semantic_search → summarize_rag or extract_ticker."""
     docs = state.get("retrieved_docs")
     if docs and len(docs) > 0:
-        print("[ROUTE] ✅ Docs found in RAG → summarize_rag.")
+        logger.debug("Route: docs found in RAG -> summarize_rag")
         return "summarize_rag"
-    print("[ROUTE] ❌ No RAG docs found → extract_ticker.")
+    logger.debug("Route: no RAG docs found -> extract_ticker")
     return "extract_ticker"
 
 
 def route_after_yahoo(state: PipelineState) -> str:
     """Route after yahoo_fetch → summarize_yahoo or rss_fallback."""
-    fetched = state.get("fetched_articles", [])
-    src = state.get("source", "none")
-    if fetched and len(fetched) > 0 and src == "yahoo_api":
-        print("[ROUTE] ✅ Yahoo API success → summarize_yahoo.")
+    # The fetch races Yahoo against RSS and dedupes the winner's articles,
+    # so any result is summarized as-is; rss_fallback only retries when
+    # both sources came back empty.
+    if state.get("fetched_articles"):
+        logger.debug("Route: articles fetched -> summarize_yahoo")
         return "summarize_yahoo"
-    print("[ROUTE] ⤵️ Yahoo API failed or empty → rss_fallback.")
+    logger.debug("Route: no articles fetched -> rss_fallback")
     return "rss_fallback"
 
 
 # ─────────────────────────────────────────────
 # Node wrappers
 # ─────────────────────────────────────────────
-def semantic_search_node(state): return semantic_search(state)
-def summarize_rag_node(state): return summarize(state)
-def extract_ticker_node(state): return extract_ticker(state)
-def yahoo_fetch_node(state): return yahoo_fetch_with_fallback(state)
-def summarize_yahoo_node(state): return summarize_articles(state)
-def rss_fallback_node(state):
+async def semantic_search_node(state): return await semantic_search(state)
+async def summarize_rag_node(state): return await summarize(state)
+async def extract_ticker_node(state): return await extract_ticker(state)
+async def yahoo_fetch_node(state): return await yahoo_fetch_with_fallback(state)
+async def summarize_yahoo_node(state): return await summarize_articles(state)
+async def rss_fallback_node(state):
     ticker = state.get("ticker", "Unknown")
-    rss_articles = get_yahoo_rss_news(ticker)
+    rss_articles = await get_yahoo_rss_news(ticker)
     if not rss_articles:
-        print(f"[WARN] RSS returned empty for {ticker}.")
+        logger.warning("RSS returned empty for %s.", ticker)
         return {"answer": f"No RSS news found for {ticker}.", "source": "rss_feed"}
-    return summarize_articles({
+    return await summarize_articles({
         "ticker": ticker,
         "fetched_articles": rss_articles,
         "source": "rss_feed"
@@ -104,7 +108,7 @@ def build_graph():
     workflow.add_edge("summarize_yahoo", END)
     workflow.add_edge("rss_fallback", END)
 
-    print("[INFO] ✅ Workflow graph successfully built.")
+    logger.info("Workflow graph successfully built.")
     return workflow.compile()
 
 
@@ -1,34 +1,69 @@
 """Pipeline nodes for the financial news RAG workflow.
 
-Each node is a pure function that accepts and returns a state dictionary.
-Nodes implement semantic search, summarization, ticker extraction, and
-news fetching with RSS fallback.
+Each node accepts and returns a state dictionary. Nodes implement semantic
+search, summarization, ticker extraction, and news fetching with RSS
+fallback. Nodes that do network I/O (Gemini, Qdrant, Yahoo) are coroutines,
+so the compiled graph must be run with ``ainvoke``/``astream``.
 """
 
 from typing_extensions import TypedDict
+import asyncio
+from cachetools import LRUCache, TTLCache
 from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
 from google import genai
 from google.genai import types
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from langgraph.config import get_stream_writer
+from selectolax.parser import HTMLParser
+from contextvars import ContextVar
 import feedparser
-import requests
+import httpx
+import logging
+import numpy as np
 import os
+import re
+import threading
+import weakref
 
-from AI_Chatbot.clients.yahoo_client import get_yahoo_news
+from AI_Chatbot.clients.cache_client import body_store
+from AI_Chatbot.clients.embedding_client import (
+    embedder, encode_cached, reranker, RAG_SCORE_THRESHOLD, VECTOR_SIZE
+)
+from AI_Chatbot.clients.llm_cache import LLMResponseCache
+from AI_Chatbot.clients.search_batcher import MicroBatcher
+from AI_Chatbot.clients.yahoo_client import aget_yahoo_news
+from AI_Chatbot.pipeline.tickers import match_local_tickers
 
 
+logger = logging.getLogger(__name__)
+
 # Load environment and initialize clients
 load_dotenv()
 if not os.getenv("GEMINI_API_KEY"):
     raise ValueError("GEMINI_API_KEY environment variable is required")
 
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 MODEL_NAME = "gemini-2.0-flash"
-embedder = SentenceTransformer("sentence-transformers/all-mpnet-base-v2")
-qdrant = QdrantClient(url="http://localhost:6333")
-collection_name = "news_embeddings"
+# Same settings as AI_Chatbot/clients/qdrant_client.py, which seeds the
+# collection this module searches.
+QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))
+COLLECTION_NAME = os.getenv("QDRANT_COLLECTION", "news_embeddings")
+# Searches go over gRPC: vectors travel as packed floats rather than JSON
+# number arrays. Keep-alive pings stop idle proxies and NATs from dropping
+# the channel between queries.
+qdrant = QdrantClient(
+    url=QDRANT_URL,
+    prefer_grpc=True,
+    grpc_port=QDRANT_GRPC_PORT,
+    timeout=QDRANT_TIMEOUT,
+    grpc_options={
+        "grpc.keepalive_time_ms": 30_000,
+        "grpc.keepalive_timeout_ms": 10_000,
+        "grpc.keepalive_permit_without_calls": 1,
+    },
+)
 
 # ─────────────────────────────────────────────
 # Define pipeline state
@@ -36,7 +71,7 @@ collection_name = "news_embeddings"
 class PipelineState(TypedDict):
     """TypedDict describing the pipeline state shape."""
     query: str
-    retrieved_docs: list
+    retrieved_docs: dict
     answer: str
     ticker: str
     fetched_articles: list
@@ -46,53 +81,229 @@ class PipelineState(TypedDict):
 # ─────────────────────────────────────────────
 # 1️⃣ Semantic Search (RAG)
 # ─────────────────────────────────────────────
-def semantic_search(state: PipelineState) -> dict:
-    """Retrieve top-k documents from Qdrant using the query vector."""
-    query = state["query"]
-    query_vec = embedder.encode([query])[0].tolist()
-
-    results = qdrant.search(
-        collection_name=collection_name,
-        query_vector=query_vec,
-        limit=3,
-        with_payload=True,
+SEARCH_LIMIT = 3
+# With a reranker, fetch a wider candidate set for it to reorder.
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "20"))
+RERANK_TEXT_CHARS = 512
+SEARCH_CANDIDATES = RERANK_CANDIDATES if reranker is not None else SEARCH_LIMIT
+QUERY_CACHE_SIZE = 4096
+QUERY_BATCH_SIZE = 32
+SEARCH_BATCH_WINDOW = 0.02
+# Search the INT8 index, then rescore the top 2×limit with the fp32 originals.
+SEARCH_PARAMS = rest.SearchParams(
+    quantization=rest.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+# Only the fields the nodes read; full_text is present only in collections
+# seeded before bodies moved to the body store.
+SEARCH_PAYLOAD = ["title", "ticker", "summary", "full_text"]
+# Longer bodies would be cut by the context limit in summarize anyway.
+RETRIEVED_TEXT_CHARS = 2500
+# Normalized query text → read-only unit-length query vector.
+query_vector_cache = LRUCache(maxsize=QUERY_CACHE_SIZE)
+# Searches from concurrent sessions hit the cache from worker threads.
+_query_vector_lock = threading.Lock()
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different queries share a cache slot."""
+    return " ".join(query.split())
+
+
+def embed_queries(queries: list) -> list:
+    """Return one unit-length vector per query, encoding only cache misses.
+
+    Misses are encoded together in a single batched ``encode`` call. Stored
+    vectors are unit-length and searched by dot product, so query vectors
+    are normalized the same way.
+    """
+    keys = [_normalize_query(q) for q in queries]
+    with _query_vector_lock:
+        found = {k: query_vector_cache[k] for k in keys if k in query_vector_cache}
+    misses = list(dict.fromkeys(k for k in keys if k not in found))
+    if misses:
+        fresh = embedder.encode(
+            misses,
+            batch_size=QUERY_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        for key, vector in zip(misses, fresh):
+            # Shared between callers via the cache; guard against mutation.
+            vector.flags.writeable = False
+            found[key] = vector
+        with _query_vector_lock:
+            query_vector_cache.update((k, found[k]) for k in misses)
+    return [found[k] for k in keys]
+
+
+def _query_qdrant(vectors: list) -> list:
+    """Send one ``query_batch_points`` call for a batch of query vectors."""
+    responses = qdrant.query_batch_points(
+        collection_name=COLLECTION_NAME,
+        requests=[
+            rest.QueryRequest(
+                query=v.tolist(),
+                limit=SEARCH_CANDIDATES,
+                with_payload=SEARCH_PAYLOAD,
+                params=SEARCH_PARAMS,
+            )
+            for v in vectors
+        ],
     )
+    return [response.points for response in responses]
+
+
+def warm_up() -> None:
+    """Run one encode and one search so the first real query starts warm.
+
+    Pays up front for lazy kernel setup in the model, the gRPC channel
+    handshake, and paging the collection's quantized vectors into RAM.
+    The query vector cache is bypassed so the dummy text is not kept.
+    """
+    vector = embedder.encode(["warmup"], convert_to_numpy=True, normalize_embeddings=True)[0]
+    _query_qdrant([vector])
+
+
+# Concurrent sessions' searches within a 20 ms window share one request.
+search_batcher = MicroBatcher(_query_qdrant, window=SEARCH_BATCH_WINDOW)
+llm_cache = LLMResponseCache(qdrant, VECTOR_SIZE)
+
+
+# Event loop → Gemini client. ``client.aio`` keeps a transport bound to the
+# loop it first ran on, and each graph run has its own loop (one per
+# Streamlit session thread), so clients are per loop and die with it.
+_gemini_clients = weakref.WeakKeyDictionary()
+_gemini_lock = threading.Lock()
+
+
+def _gemini() -> genai.Client:
+    """Return the Gemini client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _gemini_lock:
+        client = _gemini_clients.get(loop)
+        if client is None:
+            client = _gemini_clients[loop] = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    return client
+
+
+def _stream_writer():
+    """Return the graph's custom stream writer, or a no-op outside a graph run."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return lambda _chunk: None
 
-    filtered = [r for r in results if r.score >= 0.5]
-    if not filtered:
+
+async def _generate(node: str, prompt: str, config, question: str = "", scope: str = "",
+                    stream: bool = False) -> str:
+    """Return Gemini's stripped response to ``prompt``, served from cache when possible.
+
+    With ``question`` set, a cached response to a near-identical question
+    over the same ``scope`` (e.g. the retrieved context) is reused as well;
+    leave it empty for prompts whose content goes stale.
+    With ``stream`` set, text is also emitted as ``{"node", "delta"}`` chunks
+    on the graph's ``custom`` stream as Gemini produces it.
+    """
+    vector = None
+    if question:
+        (vector,) = await asyncio.to_thread(embed_queries, [question])
+    cached = await asyncio.to_thread(llm_cache.lookup, node, prompt, vector, scope)
+    if cached is not None:
+        if stream:
+            _stream_writer()({"node": node, "delta": cached})
+        return cached
+
+    if stream:
+        write = _stream_writer()
+        parts = []
+        async for chunk in await _gemini().aio.models.generate_content_stream(
+            model=MODEL_NAME, contents=[prompt], config=config
+        ):
+            if chunk.text:
+                parts.append(chunk.text)
+                write({"node": node, "delta": chunk.text})
+        text = "".join(parts).strip()
+    else:
+        response = await _gemini().aio.models.generate_content(
+            model=MODEL_NAME, contents=[prompt], config=config
+        )
+        text = response.text.strip() if response and response.text else ""
+    if text:
+        await asyncio.to_thread(llm_cache.store, node, prompt, text, vector, question, scope)
+    return text
+
+
+def _to_retrieved_docs(query: str, results: list) -> dict:
+    """Turn one query's Qdrant hits into a ``retrieved_docs`` state update.
+
+    ``retrieved_docs`` holds parallel ``titles``/``tickers``/``full_texts``/
+    ``scores`` lists, or None when no hit clears the score threshold. With
+    a reranker loaded, the surviving candidates are reordered by it in one
+    batched call and cut to ``SEARCH_LIMIT``.
+    """
+    scores = np.fromiter((r.score for r in results), dtype=np.float32, count=len(results))
+    keep = np.flatnonzero(scores >= RAG_SCORE_THRESHOLD)
+    if not keep.size:
         # No relevant documents found; caller should fallback to external sources
         return {"retrieved_docs": None}
 
-    retrieved_docs = [
-        {
-            "title": r.payload.get("title", "Untitled"),
-            "ticker": r.payload.get("ticker", ""),
-            "full_text": r.payload.get("full_text", ""),
-            "score": r.score,
-        }
-        for r in filtered
+    hits = [results[i] for i in keep]
+    # Bodies live in the local body store; collections seeded before that
+    # still carry full_text in the payload.
+    full_texts = [
+        (
+            body_store.get(str(r.id))
+            or r.payload.get("full_text")
+            or r.payload.get("summary", "")
+        )[:RETRIEVED_TEXT_CHARS]
+        for r in hits
     ]
-    return {"retrieved_docs": retrieved_docs}
+    order = range(len(hits))
+    if reranker is not None:
+        rerank_scores = reranker.predict(
+            [(query, text[:RERANK_TEXT_CHARS]) for text in full_texts], batch_size=32
+        )
+        order = np.argsort(-np.asarray(rerank_scores))[:SEARCH_LIMIT]
+
+    return {
+        "retrieved_docs": {
+            "titles": [hits[i].payload.get("title", "Untitled") for i in order],
+            "tickers": [hits[i].payload.get("ticker", "") for i in order],
+            "full_texts": [full_texts[i] for i in order],
+            "scores": [hits[i].score for i in order],
+        }
+    }
+
+
+async def semantic_search_batch(states: list) -> list:
+    """Run semantic search for several states with one encode and one search call.
+
+    Returns one ``retrieved_docs`` update per state, in order.
+    """
+    queries = [state["query"] for state in states]
+    # Encoding is CPU-bound; keep it off the event loop.
+    vectors = await asyncio.to_thread(embed_queries, queries)
+    batches = await asyncio.gather(
+        *(asyncio.wrap_future(search_batcher.submit(v)) for v in vectors)
+    )
+    # Body-store reads and reranking block; keep them off the event loop too.
+    return await asyncio.gather(
+        *(asyncio.to_thread(_to_retrieved_docs, q, results) for q, results in zip(queries, batches))
+    )
+
+
+async def semantic_search(state: PipelineState) -> dict:
+    """Retrieve top-k documents from Qdrant using the query vector."""
+    (update,) = await semantic_search_batch([state])
+    return update
 
 
 # ─────────────────────────────────────────────
 # 2️⃣ Summarize from RAG
 # ─────────────────────────────────────────────
-def summarize(state: PipelineState) -> dict:
-    """Use Gemini to answer using retrieved context from RAG."""
-    query = state["query"]
-    retrieved_docs = state.get("retrieved_docs", [])
-
-    if not retrieved_docs:
-        return {"answer": "No relevant data found.", "source": "rag_empty"}
-
-    # Build context from retrieved docs
-    context = "\n\n".join(
-        [f"[{i+1}] {doc['title']} ({doc['ticker']})\n{doc['full_text']}"
-         for i, doc in enumerate(retrieved_docs)]
-    )[:7000]
+CONTEXT_CHAR_LIMIT = 7000
 
-    prompt = f"""
+_SUMMARIZE_TMPL = """
 You are a financial assistant. Answer the question *only* using the following context.
 If the context is irrelevant to the question, reply EXACTLY: "No relevant data found."
 
@@ -103,13 +314,48 @@ Question: {query}
 Answer:
 """
 
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=[prompt],
-        config=types.GenerateContentConfig(temperature=0.2),
+
+def _build_context(chunks, limit: int = CONTEXT_CHAR_LIMIT) -> str:
+    """Join ``chunks`` with blank lines, stopping at ``limit`` characters.
+
+    ``chunks`` may be a generator; chunks past the limit are never built.
+    The result equals slicing the full join to ``limit``.
+    """
+    parts = []
+    length = 0
+    for chunk in chunks:
+        length += len(chunk) + (2 if parts else 0)
+        parts.append(chunk)
+        if length >= limit:
+            break
+    return "\n\n".join(parts)[:limit]
+
+
+async def summarize(state: PipelineState) -> dict:
+    """Use Gemini to answer using retrieved context from RAG."""
+    query = state["query"]
+    retrieved_docs = state.get("retrieved_docs")
+
+    if not retrieved_docs:
+        return {"answer": "No relevant data found.", "source": "rag_empty"}
+
+    # Build context from retrieved docs
+    context = _build_context(
+        f"[{i}] {title} ({ticker})\n{full_text}"
+        for i, (title, ticker, full_text) in enumerate(
+            zip(retrieved_docs["titles"], retrieved_docs["tickers"], retrieved_docs["full_texts"]),
+            start=1,
+        )
     )
+    prompt = _SUMMARIZE_TMPL.format(context=context, query=query)
 
-    answer_text = response.text.strip() if response and response.text else "No relevant data found."
+    # Questions that differ only in the company name embed almost
+    # identically; scoping the semantic tier to the retrieved context keeps
+    # one company's answer from serving another.
+    answer_text = await _generate(
+        "summarize", prompt, types.GenerateContentConfig(temperature=0.2),
+        question=query, scope=context,
+    ) or "No relevant data found."
 
     # detect fallback trigger
     if "No relevant data found" in answer_text:
@@ -122,19 +368,9 @@ Answer:
 # ─────────────────────────────────────────────
 # 3️⃣ Extract Ticker
 # ─────────────────────────────────────────────
-def extract_ticker(state: PipelineState) -> dict:
-    """
-    Extract or infer ticker symbols from user query using Gemini.
-    Output is normalized for both yfinance and Yahoo RSS feeds.
-    """
-    query = state.get("query", "").strip()
-    if not query:
-        return {"ticker": "N/A"}
+_NORMALIZE_RE = re.compile(r"['\"\s]|TICKER:|SYMBOL:")
 
-    # ─────────────────────────────
-    # Step 1: Ask Gemini to extract ticker(s)
-    # ─────────────────────────────
-    extract_prompt = f"""
+_EXTRACT_TMPL = """
 You are a **financial data assistant**.
 
 Task:
@@ -154,34 +390,52 @@ User question:
 Answer:
 """
 
+
+async def extract_ticker(state: PipelineState) -> dict:
+    """
+    Extract or infer ticker symbols from user query using Gemini.
+    Output is normalized for both yfinance and Yahoo RSS feeds.
+    """
+    query = state.get("query", "").strip()
+    if not query:
+        return {"ticker": "N/A"}
+
+    # ─────────────────────────────
+    # Step 0: Resolve well-known symbols and company names locally
+    # ─────────────────────────────
+    local_tickers, unexplained = match_local_tickers(query)
+    if local_tickers and not unexplained:
+        return {"ticker": ",".join(sorted(local_tickers))}
+
+    # ─────────────────────────────
+    # Step 1: Ask Gemini to extract ticker(s)
+    # ─────────────────────────────
+    extract_prompt = _EXTRACT_TMPL.format(query=query)
+
     try:
-        resp = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=[extract_prompt],
-            config=types.GenerateContentConfig(temperature=0.1, max_output_tokens=20),
-        )
-        raw_ticker = resp.text.strip() if resp and resp.text else "N/A"
+        # Exact-match only: questions differing just in the company name
+        # embed almost identically and would return the other's ticker.
+        raw_ticker = await _generate(
+            "extract_ticker",
+            extract_prompt,
+            types.GenerateContentConfig(temperature=0.1, max_output_tokens=20),
+        ) or "N/A"
     except Exception:
-        raw_ticker = "N/A"
+        # Gemini is unavailable; fall back to what the table resolved.
+        raw_ticker = ",".join(local_tickers) or "N/A"
 
     # ─────────────────────────────
     # Step 2: Normalize ticker(s)
     # ─────────────────────────────
-    ticker = (
-        raw_ticker.replace('"', "")
-        .replace("'", "")
-        .replace(" ", "")
-        .replace("\n", "")
-        .upper()
-    )
-
-    # Sometimes Gemini outputs weird stuff like: "Ticker: AAPL"
-    ticker = ticker.replace("TICKER:", "").replace("SYMBOL:", "").strip(",")
+    # Strips quotes, whitespace and labels such as "Ticker: AAPL"
+    ticker = _NORMALIZE_RE.sub("", raw_ticker.upper()).strip(",")
 
     # Normalize multiple tickers: AAPL,,TSLA → AAPL,TSLA
+    # Gemini saw the whole query, so its answer overrides the table's
+    # partial one ("the Oracle of Omaha" is not ORCL).
     tickers = [t for t in ticker.split(",") if t and t != "N/A"]
     if not tickers:
-        print(f"[WARN] No ticker extracted from query: {query}")
+        logger.warning("No ticker extracted from query: %s", query)
         return {"ticker": "N/A"}
 
     # For consistency across APIs (yfinance + RSS)
@@ -189,39 +443,138 @@ Answer:
     clean_tickers = ",".join(sorted(set(tickers)))
     # Return normalized comma-separated tickers
     return {"ticker": clean_tickers}
-    return {"ticker": clean_tickers}
 
 # ─────────────────────────────────────────────
 # 4️⃣ Helper: RSS + Scraper
 # ─────────────────────────────────────────────
-def scrape_yahoo_article(url: str) -> str:
+SCRAPE_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; StockBot/1.0)"}
+SCRAPE_TIMEOUT = 8
+SCRAPE_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+SCRAPE_RETRIES = 2
+# Pages larger than this are image/video-heavy and not worth downloading.
+SCRAPE_MAX_BYTES = 2 * 1024 * 1024
+# The AsyncClient shared by the scrapes of one RSS fetch; each graph run
+# has its own event loop, so a client cannot outlive the call that made it.
+_http_client: ContextVar = ContextVar("http_client", default=None)
+FEED_TTL = 60
+# Feed URL → parsed entries, reused without a request while fresh.
+_feed_entries = TTLCache(maxsize=512, ttl=FEED_TTL)
+# Feed URL → (etag, last_modified, entries), for conditional GETs once stale.
+_feed_validators = LRUCache(maxsize=512)
+# cachetools caches are not thread-safe; sessions run on separate threads.
+_feed_lock = threading.Lock()
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    # Connection failures are retried by the transport before surfacing.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True, limits=SCRAPE_LIMITS, retries=SCRAPE_RETRIES
+    )
+    return httpx.AsyncClient(
+        headers=SCRAPE_HEADERS,
+        timeout=SCRAPE_TIMEOUT,
+        transport=transport,
+        follow_redirects=True,
+    )
+
+
+async def _fetch_page(http: httpx.AsyncClient, url: str):
+    """Return the page body as bytes, or None on error or oversized page."""
+    async with http.stream("GET", url) as r:
+        if r.status_code != 200:
+            return None
+        if int(r.headers.get("content-length") or 0) > SCRAPE_MAX_BYTES:
+            return None
+        return await r.aread()
+
+
+async def scrape_yahoo_article(url: str) -> str:
     """Return the scraped article body for the given URL, or empty string."""
     try:
-        headers = {"User-Agent": "Mozilla/5.0 (compatible; StockBot/1.0)"}
-        r = requests.get(url, headers=headers, timeout=8)
-        if r.status_code != 200:
+        http = _http_client.get()
+        if http is None:
+            async with _new_http_client() as http:
+                content = await _fetch_page(http, url)
+        else:
+            content = await _fetch_page(http, url)
+        if not content:
             return ""
-        soup = BeautifulSoup(r.text, "html.parser")
-        paragraphs = soup.select("article p") or soup.select("p")
-        text = " ".join(p.get_text(strip=True) for p in paragraphs)
+        # Parse the raw bytes in C; the parser sniffs the charset itself.
+        tree = HTMLParser(content)
+        paragraphs = tree.css("article p") or tree.css("p")
+        text = " ".join(t for t in (p.text(strip=True) for p in paragraphs) if t)
         if len(text) < 200:
-            desc = soup.find("meta", {"name": "description"})
-            if desc and desc.get("content"):
-                text = desc["content"]
+            desc = tree.css_first('meta[name="description"]')
+            if desc and desc.attributes.get("content"):
+                text = desc.attributes["content"]
         return text.strip()
     except Exception:
         return ""
 
 
-def get_yahoo_rss_news(ticker: str, num_articles: int = 5):
-    """Fetch RSS feed entries for a ticker as a fallback source."""
-    url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker.upper()}&region=US&lang=en-US"
-    feed = feedparser.parse(url)
-    if not feed.entries:
+async def _fetch_feed_entries(http: httpx.AsyncClient, url: str) -> list:
+    """Return the feed's entries, parsing it only when it has changed.
+
+    Entries are reused outright for ``FEED_TTL`` seconds; after that the
+    feed is re-requested with its ETag/Last-Modified and a 304 keeps the
+    previously parsed entries.
+    """
+    with _feed_lock:
+        entries = _feed_entries.get(url)
+        validators = _feed_validators.get(url)
+    if entries is not None:
+        return entries
+
+    headers = {}
+    if validators:
+        etag, modified, _ = validators
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+    r = await http.get(url, headers=headers)
+    if r.status_code == 304 and validators:
+        entries = validators[2]
+    elif r.status_code == 200:
+        entries = feedparser.parse(r.content).entries
+        with _feed_lock:
+            _feed_validators[url] = (
+                r.headers.get("etag"), r.headers.get("last-modified"), entries
+            )
+    else:
+        # Errors are not cached; the next call retries.
         return []
+    with _feed_lock:
+        _feed_entries[url] = entries
+    return entries
+
+
+async def get_yahoo_rss_news(ticker: str, num_articles: int = 5):
+    """Fetch RSS feed entries for a ticker as a fallback source.
+
+    The feed and every linked article are fetched over one pooled HTTP/2
+    client, and the articles are scraped concurrently.
+    """
+    url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker.upper()}&region=US&lang=en-US"
+    async with _new_http_client() as http:
+        token = _http_client.set(http)
+        try:
+            try:
+                feed_entries = await _fetch_feed_entries(http, url)
+            except httpx.HTTPError:
+                return []
+            entries = feed_entries[:num_articles]
+            if not entries:
+                return []
+            texts = await asyncio.gather(
+                *(scrape_yahoo_article(e.link) for e in entries), return_exceptions=True
+            )
+        finally:
+            _http_client.reset(token)
+
     articles = []
-    for e in feed.entries[:num_articles]:
-        full_text = scrape_yahoo_article(e.link) or e.get("summary", "")
+    for e, text in zip(entries, texts):
+        full_text = (text if isinstance(text, str) else "") or e.get("summary", "")
         articles.append(
             {
                 "ticker": ticker.upper(),
@@ -239,62 +592,88 @@ def get_yahoo_rss_news(ticker: str, num_articles: int = 5):
 # 5️⃣ Yahoo Fetch → RSS Fallback
 # ─────────────────────────────────────────────
 
-def yahoo_fetch_with_fallback(state: PipelineState) -> dict:
-    """Try Yahoo Finance API first; if empty or error, fallback to RSS feed."""
+async def _fetch_or_empty(fetch, ticker: str) -> list:
+    """Await ``fetch(ticker, num_articles=5)``, treating errors as no articles."""
+    try:
+        articles = await fetch(ticker, num_articles=5)
+    except Exception:
+        return []
+    return articles if isinstance(articles, list) else []
+
+
+# Articles whose title + lead embed closer than this to an earlier kept
+# article are treated as reprints of it.
+DEDUP_THRESHOLD = 0.88
+DEDUP_LEAD_CHARS = 500
+
+
+def _dedupe_articles(articles: list) -> list:
+    """Drop near-duplicate articles (wire reprints), keeping the first of each."""
+    if len(articles) < 2:
+        return articles
+    texts = [
+        f"{a.get('title', '')}\n{(a.get('full_text') or a.get('summary', ''))[:DEDUP_LEAD_CHARS]}"
+        for a in articles
+    ]
+    vectors = encode_cached(texts, normalize_embeddings=True, batch_size=len(texts))
+    # Unit vectors, so one matrix product gives every pairwise cosine.
+    sims = vectors @ vectors.T
+    kept = []
+    for i in range(len(articles)):
+        if all(sims[i, j] <= DEDUP_THRESHOLD for j in kept):
+            kept.append(i)
+    return [articles[i] for i in kept]
+
+
+async def yahoo_fetch_with_fallback(state: PipelineState) -> dict:
+    """Fetch from the Yahoo Finance API and the RSS feed concurrently.
+
+    The first source to return articles wins and the other is cancelled;
+    if both finish together, the API result is preferred. Near-duplicate
+    articles are dropped before the result is returned.
+    """
     ticker = state.get("ticker", "N/A")
     if not ticker or ticker == "N/A":
         return {"fetched_articles": [], "source": "none"}
 
-    all_articles = []
-    source = "none"
-
-    # Try Yahoo API first
-    try:
-        articles = get_yahoo_news(ticker, num_articles=5)
-        if isinstance(articles, list) and len(articles) > 0:
-            return {"fetched_articles": articles, "source": "yahoo_api"}
-        else:
-            pass
-    except Exception as e:
-        # proceed to RSS fallback on error
-        pass
-
+    tasks = {
+        asyncio.create_task(_fetch_or_empty(aget_yahoo_news, ticker)): "yahoo_api",
+        asyncio.create_task(_fetch_or_empty(get_yahoo_rss_news, ticker)): "rss_feed",
+    }
+    pending = set(tasks)
     try:
-        rss_articles = get_yahoo_rss_news(ticker, num_articles=5)
-        if isinstance(rss_articles, list) and len(rss_articles) > 0:
-            return {"fetched_articles": rss_articles, "source": "rss_feed"}
-        else:
-            pass
-    except Exception as e:
-        pass
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: tasks[t] != "yahoo_api"):
+                articles = task.result()
+                if articles:
+                    logger.info("%s returned %d articles for %s", tasks[task], len(articles), ticker)
+                    try:
+                        articles = await asyncio.to_thread(_dedupe_articles, articles)
+                    except Exception as e:
+                        logger.warning("Article dedup failed for %s: %s", ticker, e)
+                    return {"fetched_articles": articles, "source": tasks[task]}
+    finally:
+        for task in pending:
+            task.cancel()
 
     # Nothing found
+    logger.info("No articles from Yahoo API or RSS for %s", ticker)
     return {"fetched_articles": [], "source": "none"}
 
 
 # ─────────────────────────────────────────────
 # 6️⃣ Summarize Articles (Yahoo or RSS)
 # ─────────────────────────────────────────────
-def summarize_articles(state: PipelineState) -> dict:
-    """Summarize fetched Yahoo or RSS articles for the given ticker."""
-    ticker = state.get("ticker", "Unknown")
-    articles = state.get("fetched_articles", [])
-    source = state.get("source", "unknown")
+# Per-field caps, so every article gets a share of the context instead of
+# the first long body using all of it.
+ARTICLE_TITLE_CHARS = 200
+ARTICLE_SUMMARY_CHARS = 300
+ARTICLE_TEXT_CHARS = 1200
 
-    if not articles:
-        return {"answer": f"No recent articles found for {ticker}.", "source": source}
-
-    # Build readable context
-    context = "\n\n".join(
-        [
-            f"[{i+1}] {a.get('title', 'Untitled')}\n{a.get('summary', '')}\n{a.get('full_text', '')}\n{a.get('link', '')}"
-            for i, a in enumerate(articles)
-        ]
-    )[:7000]
-
-    prompt = f"""
+_ARTICLES_TMPL = """
 You are a financial assistant. 
-Summarize the following {source.replace('_', ' ')} articles about {ticker}.
+Summarize the following {source} articles about {ticker}.
 Highlight market updates, analyst opinions, and investor sentiment.
 
 Articles:
@@ -303,15 +682,35 @@ Articles:
 Summary:
 """
 
+
+async def summarize_articles(state: PipelineState) -> dict:
+    """Summarize fetched Yahoo or RSS articles for the given ticker."""
+    ticker = state.get("ticker", "Unknown")
+    articles = state.get("fetched_articles", [])
+    source = state.get("source", "unknown")
+
+    if not articles:
+        return {"answer": f"No recent articles found for {ticker}.", "source": source}
+
+    # Build readable context
+    context = _build_context(
+        f"[{i+1}] {a.get('title', 'Untitled')[:ARTICLE_TITLE_CHARS]}\n"
+        f"{a.get('summary', '')[:ARTICLE_SUMMARY_CHARS]}\n"
+        f"{a.get('full_text', '')[:ARTICLE_TEXT_CHARS]}\n"
+        f"{a.get('link', '')}"
+        for i, a in enumerate(articles)
+    )
+    prompt = _ARTICLES_TMPL.format(
+        source=source.replace("_", " "), ticker=ticker, context=context
+    )
+
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=[prompt],
-            config=types.GenerateContentConfig(temperature=0.2),
-        )
-        answer_text = response.text.strip() if response and response.text else "No relevant data found."
+        # Exact-match only: fresh articles for the same ticker need a fresh summary.
+        answer_text = await _generate(
+            "summarize_articles", prompt, types.GenerateContentConfig(temperature=0.2), stream=True
+        ) or "No relevant data found."
     except Exception as e:
-        print(f"[ERROR] summarize_articles failed for {ticker}: {e}")
+        logger.error("summarize_articles failed for %s: %s", ticker, e)
         answer_text = "No relevant data found."
 
     return {"answer": answer_text, "source": source}
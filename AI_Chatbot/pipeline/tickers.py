@@ -0,0 +1,68 @@
+"""Local ticker lookup used by the ``extract_ticker`` node.
+
+Well-known symbols and company names are resolved from
+``data/company_tickers.json`` without calling Gemini. The lookup also
+reports capitalized words it could not explain, which hint at a company the
+table does not know ("Compare Apple with Rivian"); such queries still go to
+Gemini.
+"""
+
+import json
+import os
+import re
+
+COMPANY_TICKERS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "company_tickers.json"
+)
+with open(COMPANY_TICKERS_FILE, encoding="utf-8") as f:
+    # Lower-case company name → Yahoo ticker
+    COMPANY_TICKERS = json.load(f)
+
+# Symbols written out in the query, matched case-sensitively. One- and
+# two-letter symbols (F, V, GM, ...) collide with ordinary words, so those
+# companies are only recognized by name.
+_TICKER_RE = re.compile(
+    r"(?<![\w.])("
+    + "|".join(re.escape(t) for t in sorted(
+        {t for t in COMPANY_TICKERS.values() if len(t) >= 3}, key=len, reverse=True
+    ))
+    + r")(?!\w)"
+)
+# Company names count only when capitalized, and not as part of a hyphenated
+# word: "any intel on rate cuts" and "the uber-rich" name no company.
+_COMPANY_RE = re.compile(
+    r"(?<![\w-])("
+    + "|".join(re.escape(n) for n in sorted(COMPANY_TICKERS, key=len, reverse=True))
+    + r")(?![\w-])",
+    re.IGNORECASE,
+)
+_CAPITALIZED_RE = re.compile(r"(?<![\w.])[A-Z][\w&'-]*")
+_SENTENCE_START_RE = re.compile(r"(?:^|[.?!:]\s+)$")
+_NON_COMPANY_WORDS = {
+    "I", "AI", "CEO", "CFO", "EPS", "ETF", "IPO", "GDP", "US", "USA", "UK", "EU",
+    "Q1", "Q2", "Q3", "Q4", "Fed", "NYSE", "Nasdaq", "Dow", "S&P", "SEC",
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+    "January", "February", "March", "April", "May", "June", "July", "August",
+    "September", "October", "November", "December",
+}
+
+
+def match_local_tickers(query: str):
+    """Return ``(tickers, unexplained)`` for ``query``.
+
+    ``tickers`` is the set of symbols the table resolves; ``unexplained``
+    lists capitalized words that are neither part of a match, nor
+    sentence-initial, nor common non-company terms (Q3, CEO, Fed, ...).
+    """
+    symbol_matches = list(_TICKER_RE.finditer(query))
+    name_matches = [m for m in _COMPANY_RE.finditer(query) if m.group(1)[0].isupper()]
+    tickers = {m.group(1) for m in symbol_matches}
+    tickers.update(COMPANY_TICKERS[m.group(1).lower()] for m in name_matches)
+    explained = [m.span() for m in symbol_matches + name_matches]
+    unexplained = [
+        m.group() for m in _CAPITALIZED_RE.finditer(query)
+        if m.group() not in _NON_COMPANY_WORDS
+        and not _SENTENCE_START_RE.search(query[:m.start()])
+        and not any(start <= m.start() < end for start, end in explained)
+    ]
+    return tickers, unexplained
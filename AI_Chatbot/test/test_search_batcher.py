@@ -0,0 +1,71 @@
+"""
+Tests for the search micro-batcher: batching, error fan-out and
+cancelled callers.
+"""
+
+import asyncio
+import threading
+
+from AI_Chatbot.clients.search_batcher import MicroBatcher
+
+
+def test_concurrent_requests_share_one_flush():
+    calls = []
+    batcher = MicroBatcher(lambda reqs: calls.append(len(reqs)) or [r * 2 for r in reqs])
+
+    async def submit_all():
+        return await asyncio.gather(*(asyncio.wrap_future(batcher.submit(i)) for i in range(10)))
+
+    assert asyncio.run(submit_all()) == [i * 2 for i in range(10)]
+    assert calls == [10]
+
+
+def test_flush_error_reaches_every_caller():
+    def flush(reqs):
+        raise RuntimeError("qdrant down")
+
+    batcher = MicroBatcher(flush)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        assert isinstance(future.exception(timeout=2), RuntimeError)
+
+
+def test_cancelled_caller_does_not_stop_the_worker():
+    release = threading.Event()
+
+    def flush(reqs):
+        release.wait(timeout=2)
+        return reqs
+
+    batcher = MicroBatcher(flush, window=0.05)
+    cancelled = batcher.submit("gone")
+    kept = batcher.submit("kept")
+    assert cancelled.cancel()
+    release.set()
+    assert kept.result(timeout=2) == "kept"
+
+    # Cancelled by the awaiting task, as asyncio.wrap_future does.
+    async def cancel_caller():
+        task = asyncio.ensure_future(asyncio.wrap_future(batcher.submit("timeout")))
+        await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(cancel_caller())
+    assert batcher.submit("next").result(timeout=2) == "next"
+    assert batcher._worker.is_alive()
+
+
+def test_wrong_result_count_fails_the_batch():
+    batcher = MicroBatcher(lambda reqs: reqs[:-1])
+    futures = [batcher.submit(i) for i in range(2)]
+    for future in futures:
+        assert isinstance(future.exception(timeout=2), ValueError)
+    assert batcher._worker.is_alive()
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_flush()
+    test_flush_error_reaches_every_caller()
+    test_cancelled_caller_does_not_stop_the_worker()
+    test_wrong_result_count_fails_the_batch()
+    print("✅ search batcher tests passed")
@@ -0,0 +1,34 @@
+"""
+Table-driven tests for extract_ticker's local fast path: which queries are
+answered from company_tickers.json and which still go to Gemini.
+"""
+
+from AI_Chatbot.pipeline.tickers import match_local_tickers
+
+# query → (tickers resolved locally, whether the query still needs Gemini)
+CASES = {
+    "What's new about AAPL?": ({"AAPL"}, False),
+    "What is the latest news on Tesla?": ({"TSLA"}, False),
+    "How did NVDA and AMD do in Q3?": ({"NVDA", "AMD"}, False),
+    "Is Reliance Industries up after the Fed decision?": ({"RELIANCE.NS"}, False),
+    "Any news on Visa Inc": ({"V"}, False),
+    "How is Coca-Cola doing?": ({"KO"}, False),
+    "Compare Apple with Rivian": ({"AAPL"}, True),
+    "What does the Oracle of Omaha say?": ({"ORCL"}, True),
+    "I need a visa to travel. How is Apple doing?": ({"AAPL"}, False),
+    "any intel on rate cuts?": (set(), False),
+    "news on the uber-rich tax": (set(), False),
+    "is the market up today": (set(), False),
+}
+
+
+def test_local_fast_path():
+    for query, (expected, needs_gemini) in CASES.items():
+        tickers, unexplained = match_local_tickers(query)
+        assert tickers == expected, (query, tickers)
+        assert bool(unexplained) == needs_gemini, (query, unexplained)
+
+
+if __name__ == "__main__":
+    test_local_fast_path()
+    print("✅ ticker fast-path tests passed")
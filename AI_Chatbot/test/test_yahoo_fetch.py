@@ -3,11 +3,13 @@ Quick test for Yahoo Finance article fetch
 — both API and RSS fallback.
 """
 
+import asyncio
+
 from AI_Chatbot.pipeline.nodes import yahoo_fetch_with_fallback
 
 def test_yahoo_news(ticker="GOOG"):
     state = {"ticker": ticker}
-    result = yahoo_fetch_with_fallback(state)
+    result = asyncio.run(yahoo_fetch_with_fallback(state))
     print("📊 Result:")
     print(f"Source: {result.get('source')}")
     articles = result.get("fetched_articles", [])
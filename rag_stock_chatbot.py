@@ -4,7 +4,11 @@ rag_streamlit_app.py
 Streamlit interface for your RAG → Yahoo → RSS financial assistant.
 """
 
+import asyncio
+import logging
 import os
+import queue
+import threading
 import streamlit as st
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, START, END
@@ -19,6 +23,7 @@ from AI_Chatbot.pipeline.nodes import (
     extract_ticker,
     yahoo_fetch_with_fallback,
     summarize_articles,
+    warm_up,
     PipelineState,
 )
 
@@ -26,6 +31,8 @@ from AI_Chatbot.pipeline.nodes import (
 # Load environment variables
 # ─────────────────────────────────────────────
 load_dotenv()
+# Library modules log through `logging`; keep them quiet unless asked.
+logging.basicConfig(level=os.getenv("AI_CHATBOT_LOGLEVEL", "WARNING").upper())
 
 if not os.getenv("GEMINI_API_KEY"):
     st.error("❌ Missing GEMINI_API_KEY in .env file. Please add it and restart.")
@@ -42,28 +49,49 @@ with st.spinner("⚙️ Initializing Qdrant collection..."):
         st.error(f"❌ Qdrant initialization failed: {e}")
         st.stop()
 
+
+# Once per server process: the first user query would otherwise pay for
+# model kernel setup and cold Qdrant pages.
+@st.cache_resource
+def warm_pipeline():
+    try:
+        warm_up()
+    except Exception as e:
+        logging.getLogger(__name__).warning("Pipeline warm-up failed: %s", e)
+
+
+with st.spinner("🔥 Warming up embedding model and vector index..."):
+    warm_pipeline()
+
 # ─────────────────────────────────────────────
 # Build Workflow Graph
 # ─────────────────────────────────────────────
-graph = (
-    StateGraph(PipelineState)
-    .add_node("semantic_search", semantic_search)
-    .add_node("summarize_rag", summarize)
-    .add_node("extract_ticker", extract_ticker)
-    .add_node("yahoo_fetch_with_fallback", yahoo_fetch_with_fallback)
-    .add_node("summarize_articles", summarize_articles)
-    .add_edge(START, "semantic_search")
-    .add_conditional_edges(
-        "semantic_search",
-        lambda s: "summarize_rag" if s.get("retrieved_docs") else "extract_ticker",
-        {"summarize_rag": "summarize_rag", "extract_ticker": "extract_ticker"},
+# Streamlit re-runs this script on every interaction; cache the compiled
+# graph so it is built once per server process, not once per rerun.
+@st.cache_resource
+def build_graph():
+    return (
+        StateGraph(PipelineState)
+        .add_node("semantic_search", semantic_search)
+        .add_node("summarize_rag", summarize)
+        .add_node("extract_ticker", extract_ticker)
+        .add_node("yahoo_fetch_with_fallback", yahoo_fetch_with_fallback)
+        .add_node("summarize_articles", summarize_articles)
+        .add_edge(START, "semantic_search")
+        .add_conditional_edges(
+            "semantic_search",
+            lambda s: "summarize_rag" if s.get("retrieved_docs") else "extract_ticker",
+            {"summarize_rag": "summarize_rag", "extract_ticker": "extract_ticker"},
+        )
+        .add_edge("summarize_rag", END)
+        .add_edge("extract_ticker", "yahoo_fetch_with_fallback")
+        .add_edge("yahoo_fetch_with_fallback", "summarize_articles")
+        .add_edge("summarize_articles", END)
+        .compile()
     )
-    .add_edge("summarize_rag", END)
-    .add_edge("extract_ticker", "yahoo_fetch_with_fallback")
-    .add_edge("yahoo_fetch_with_fallback", "summarize_articles")
-    .add_edge("summarize_articles", END)
-    .compile()
-)
+
+
+graph = build_graph()
 
 # ─────────────────────────────────────────────
 # Streamlit UI
@@ -79,21 +107,64 @@ st.markdown(
 query = st.text_input("💬 Your question:", placeholder="e.g. What’s new about AAPL?")
 submit = st.button("Run Analysis")
 
+def stream_answer(state: dict, result: dict):
+    """Run the graph on a worker thread, yielding answer text as it streams.
+
+    The graph's nodes are coroutines, so it runs on its own event loop;
+    streamed text and the final state are handed back through a queue so
+    ``st.write_stream`` can consume them from the script thread. ``result``
+    is filled with the final state.
+    """
+    chunks = queue.Queue()
+
+    async def produce():
+        try:
+            async for mode, chunk in graph.astream(state, stream_mode=["custom", "values"]):
+                chunks.put((mode, chunk))
+        except Exception as e:
+            chunks.put(("error", e))
+        finally:
+            chunks.put(("done", None))
+
+    threading.Thread(target=asyncio.run, args=(produce(),), daemon=True).start()
+    while True:
+        mode, chunk = chunks.get()
+        if mode == "done":
+            return
+        if mode == "error":
+            raise chunk
+        if mode == "values":
+            result.clear()
+            result.update(chunk)
+        elif chunk.get("delta"):
+            yield chunk["delta"]
+
+
 if submit and query:
     with st.spinner("🔎 Analyzing... please wait..."):
         state = {"query": query}
-        result = graph.invoke(state)
+        result = {}
+
+        st.markdown("### 🧠 Summary")
+        summary = st.empty()
+        with summary:
+            streamed = st.write_stream(stream_answer(state, result))
 
         answer = result.get("answer", "No answer generated.")
         source = result.get("source", "unknown")
 
-        st.markdown("### 🧠 Summary")
-        st.write(answer)
+        # The streamed text is a preview; the final state is authoritative
+        # (RAG answers are not streamed, and a failed stream falls back).
+        if not isinstance(streamed, str) or streamed.strip() != answer:
+            summary.write(answer)
         st.markdown(f"**Source:** `{source}`")
 
         # Display retrieved docs if RAG was used
         if result.get("retrieved_docs"):
             st.markdown("### 📚 Retrieved from Qdrant")
-            for i, doc in enumerate(result["retrieved_docs"], start=1):
-                st.markdown(f"**{i}. {doc['title']} ({doc['ticker']})** — Score: {doc['score']:.3f}")
-                st.text(doc["full_text"][:250] + "…")
+            docs = result["retrieved_docs"]
+            for i, (title, ticker, full_text, score) in enumerate(
+                zip(docs["titles"], docs["tickers"], docs["full_texts"], docs["scores"]), start=1
+            ):
+                st.markdown(f"**{i}. {title} ({ticker})** — Score: {score:.3f}")
+                st.text(full_text[:250] + "…")